@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import socket
 from typing import Any
 
 from pymodbus.client import AsyncModbusSerialClient
@@ -14,6 +15,9 @@ class BaseGateway:
     async def exchange(self, payload: Any) -> Any:
         raise NotImplementedError
 
+    def close(self) -> None:
+        """Release the underlying transport/device; safe to call twice."""
+
 
 class TCPGateway(BaseGateway):
     def __init__(self, ip: str, port: int, timeout: int = 5):
@@ -28,12 +32,34 @@ class TCPGateway(BaseGateway):
         self.writer = None
         self.reader = None
 
+    def close(self) -> None:
+        self._close()
+
+    def _tune_socket(self) -> None:
+        # The link carries tiny request/response exchanges every poll tick;
+        # disable Nagle (and delayed ACKs where available) so each command
+        # and reply goes out immediately instead of waiting to coalesce.
+        sock = self.writer.get_extra_info("socket") if self.writer else None
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        quickack = getattr(socket, "TCP_QUICKACK", None)
+        if quickack is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, quickack, 1)
+            except OSError:
+                pass
+
     async def _ensure_connected(self) -> bool:
         if self.writer and not self.writer.is_closing() and self.reader and not self.reader.at_eof():
             return True
         self._close()
         try:
             self.reader, self.writer = await asyncio.open_connection(*self.address)
+            self._tune_socket()
             logger.info(f"Connected to TCP gateway: {self.address}")
             return True
         except Exception as e:
@@ -107,6 +133,9 @@ class ModbusGateway(BaseGateway):
                 self._consecutive_failures = 0
                 return None
 
+    def close(self) -> None:
+        self.client.close()
+
 
 class GPIOEncoderGateway(BaseGateway):
     def __init__(self, pin_a: int, pin_b: int):
@@ -125,6 +154,11 @@ class GPIOEncoderGateway(BaseGateway):
             return None
         return self.encoder.steps
 
+    def close(self) -> None:
+        if self.encoder is not None:
+            self.encoder.close()
+            self.encoder = None
+
 
 async def test_tcp_gateway():
     gateway = TCPGateway("127.0.0.1", 1026)
@@ -2,12 +2,27 @@ import argparse
 import asyncio
 import json
 import logging
+import logging.handlers
+import math
+import queue
 import random
 import signal
 import socket
+import struct
 import sys
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # only required when config sets wire_format: msgpack
+    msgpack = None
+
 sys.path.append(str(Path(__file__).resolve().parent))
 
 try:
@@ -16,7 +31,91 @@ except ImportError:
     from sensor import load_sensors_from_yaml
 
 
+class ClientDisconnected(Exception):
+    """Raised by _receive_loop on clean EOF so the TaskGroup tears down the
+    sibling send loop; deliberately not an OSError so the loop's own
+    disconnect handling doesn't double-log it."""
+
+
+class TelemetryPublisher(asyncio.DatagramProtocol):
+    """Optional UDP fan-out for the sensor_data stream.
+
+    Periodic telemetry tolerates a dropped sample better than a queued one,
+    so UDP clients get the stream without drain bookkeeping or head-of-line
+    blocking: one sendto per subscriber per tick. Clients register by
+    sending "HELLO" to the UDP port and deregister with "BYE"; control
+    messages (sensor config requests) stay on TCP.
+
+    Registrations expire: a client that stops re-sending HELLO within ttl
+    seconds is dropped, so crashed or departed clients (which never send
+    BYE, and for which error_received carries no address to act on) don't
+    keep receiving frames forever or grow the subscriber map unbounded.
+    """
+
+    def __init__(self, logger: logging.Logger, ttl: float = 30.0):
+        self.logger = logger
+        self.ttl = float(ttl)
+        self.transport: asyncio.DatagramTransport | None = None
+        # addr -> monotonic last-HELLO time; truthiness checks by the
+        # producer work the same as with the previous set.
+        self.subscribers: dict = {}
+        self._next_purge = time.monotonic() + self.ttl
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        command = data.strip().upper()
+        if command == b"HELLO":
+            if addr not in self.subscribers:
+                self.logger.info("UDP subscriber registered: %s", addr)
+            self.subscribers[addr] = time.monotonic()
+        elif command == b"BYE":
+            if self.subscribers.pop(addr, None) is not None:
+                self.logger.info("UDP subscriber deregistered: %s", addr)
+
+    def error_received(self, exc):
+        # The datagram protocol reports errors without the offending
+        # address, so stale peers are handled by the ttl purge instead.
+        self.logger.warning("UDP telemetry error: %s", exc)
+
+    def publish(self, frame: bytes):
+        transport = self.transport
+        if transport is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_purge:
+            deadline = now - self.ttl
+            for addr in [a for a, seen in self.subscribers.items() if seen < deadline]:
+                del self.subscribers[addr]
+                self.logger.info("UDP subscriber expired: %s", addr)
+            self._next_purge = now + self.ttl
+        for addr in self.subscribers:
+            transport.sendto(frame, addr)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+
 class PiServer:
+    # Per-message-type envelope skeletons, filled lazily by _envelope_prefix().
+    _envelope_prefixes: dict[str, bytes] = {}
+    # Background log writer; started by _setup_logging, stopped in _shutdown.
+    _log_listener: logging.handlers.QueueListener | None = None
+    # The QueueHandler feeding it; swapped back out when the listener stops
+    # so late log calls still reach a real handler.
+    _queue_handler: logging.handlers.QueueHandler | None = None
+    # On-wire encoding; "msgpack" frames are much smaller and cheaper to
+    # decode than JSON for the 100 Hz stream, and "raw" packs sensor_data
+    # down to 8 bytes per value. Class-level default so partially
+    # constructed instances (tests) still serialize as JSON.
+    _wire_format: str = "json"
+    # Sensor-name order for "raw" sensor_data frames; resolved lazily from
+    # sensors_config so both ends agree on the field layout.
+    _raw_field_order: "tuple[str, ...] | None" = None
+
     def __init__(self, config_path: str, test_mode: bool = False):
         self.config_file_path = Path(config_path).expanduser().resolve()
         self.config = self._load_config()
@@ -29,6 +128,31 @@ class PiServer:
         self.test_sensor_ids: list[str] = []
         self.sensor_name_by_id: dict[str, str] = {}
         self._is_shutting_down = False
+        # Hot-path settings are read from config once; send_loop and
+        # send_message run at up to 100 Hz per client and should not pay a
+        # dict lookup per tick.
+        self._send_delay = float(self.config.get("send_delay", 0.01))
+        self._drain_timeout = float(self.config.get("drain_timeout", 5.0))
+        self._wire_format = str(self.config.get("wire_format", "json")).lower()
+        if self._wire_format not in {"json", "msgpack", "raw"}:
+            raise ValueError(f"Invalid wire_format in config: {self._wire_format}")
+        if self._wire_format == "msgpack" and msgpack is None:
+            raise RuntimeError("msgpack is required for wire_format 'msgpack'. Install with: pip install msgpack")
+        # Broadcast state: one producer task serializes each sensor_data
+        # frame once; client handlers wait on _frame_event and forward
+        # _latest_frame, so encoding cost is O(1) in the client count.
+        # The event is created in run() so it binds to the running loop.
+        self._latest_frame: bytes | None = None
+        # Raw-frame variant for clients that negotiated binary mode on the
+        # control channel; only built while at least one such client is
+        # connected (or when wire_format is already "raw").
+        self._latest_raw_frame: bytes | None = None
+        self._binary_clients = 0
+        self._frame_event: asyncio.Event | None = None
+        self._producer_task: asyncio.Task | None = None
+        self._serve_task: asyncio.Task | None = None
+        self._shutdown_task: "asyncio.Future | None" = None
+        self._udp_publisher: TelemetryPublisher | None = None
         self.sensor_config_data = self._load_sensor_config_data()
 
         self.sensor_name_by_id = self._load_sensor_name_map()
@@ -41,9 +165,13 @@ class PiServer:
         if not config_file.is_file():
             raise FileNotFoundError(f"Config file not found: {config_file}")
         try:
-            with open(config_file, "r", encoding="utf-8") as f:
-                config = json.load(f)
-        except json.JSONDecodeError as e:
+            # Read raw bytes and let the parser handle UTF-8 itself; both
+            # orjson and stdlib json accept bytes, so there is no separate
+            # text-mode decode pass.
+            raw = config_file.read_bytes()
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError as e:
+            # Covers json.JSONDecodeError and orjson.JSONDecodeError alike.
             raise ValueError(f"Invalid JSON in config file {config_file}: {e}") from e
 
         if not isinstance(config, dict):
@@ -57,19 +185,44 @@ class PiServer:
             raise ValueError(f"Invalid log_level in config: {level_name}")
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
+        # Log records are pushed to an in-memory queue and written out by a
+        # QueueListener on a background thread, so the event loop never
+        # blocks on stream I/O from log calls in the 100 Hz paths.
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers: list[logging.Handler] = [stream_handler]
+
+        # Optional on-disk log; file writes and rotations happen on the
+        # listener thread, never on the event loop.
+        log_file = self.config.get("log_file")
+        if log_file:
+            log_path = Path(log_file).expanduser()
+            if not log_path.is_absolute():
+                log_path = self.config_file_path.parent / log_path
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_path,
+                maxBytes=int(self.config.get("log_max_bytes", 5 * 1024 * 1024)),
+                backupCount=int(self.config.get("log_backup_count", 3)),
+                encoding="utf-8",
+            )
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._queue_handler = queue_handler
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+
         root_logger = logging.getLogger()
         root_logger.setLevel(level)
         root_logger.handlers.clear()
-        root_stream_handler = logging.StreamHandler()
-        root_stream_handler.setFormatter(formatter)
-        root_logger.addHandler(root_stream_handler)
+        root_logger.addHandler(queue_handler)
 
         logger = logging.getLogger("TCPServer")
         logger.setLevel(level)
         logger.handlers.clear()
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
+        logger.addHandler(queue_handler)
         logger.propagate = False
         return logger
 
@@ -152,8 +305,9 @@ class PiServer:
             return {}
 
         sensor_ids = list(self.sensors.keys())
+        sensor_timeout = self.config.get("sensor_timeout", 1.0)
         tasks = [
-            asyncio.wait_for(self.sensors[sensor_id].get_value(), timeout=self.config.get("sensor_timeout", 1.0))
+            asyncio.wait_for(self.sensors[sensor_id].get_value(), timeout=sensor_timeout)
             for sensor_id in sensor_ids
         ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -162,27 +316,174 @@ class PiServer:
         for sensor_id, result in zip(sensor_ids, results):
             sensor_name = self.sensor_name_by_id.get(sensor_id, sensor_id)
             if isinstance(result, BaseException):
-                self.logger.warning(f"Sensor {sensor_id} read failed: {result}")
+                self.logger.warning("Sensor %s read failed: %s", sensor_id, result)
                 payload[sensor_name] = None
             elif result is None:
-                self.logger.warning(f"Sensor {sensor_id} returned no data")
+                self.logger.warning("Sensor %s returned no data", sensor_id)
                 payload[sensor_name] = None
             else:
                 payload[sensor_name] = float(result)
         return payload
 
-    def _build_message(self, message_type: str, payload: dict) -> bytes:
-        return json.dumps({"message_type": message_type, "payload": payload}, ensure_ascii=False).encode("utf-8") + b"\n"
+    async def _producer(self):
+        # Pace ticks against absolute monotonic deadlines instead of a
+        # relative sleep per iteration; sleep(delay) accumulates drift
+        # because poll + serialize time is added on top of every tick.
+        # Deadline-based sleeps keep the long-run cadence accurate.
+        # Locals are LOAD_FAST in CPython; bind the per-tick attribute and
+        # method lookups once for the lifetime of the loop.
+        send_delay = self._send_delay
+        # Sensors that update slower than the broadcast rate need not be
+        # polled every tick; sensor_poll_delay lets hardware reads run at
+        # their own cadence while clients keep receiving the latest sample
+        # at send_delay intervals.
+        poll_delay = float(self.config.get("sensor_poll_delay", send_delay))
+        # Opt-in latest-value dedup: when the payload hasn't changed since
+        # the last broadcast, skip the tick entirely (no encode, no wake,
+        # no egress) until heartbeat_interval forces a keepalive frame.
+        # Off by default so real-time consumers keep a fixed cadence.
+        dedup = bool(self.config.get("dedup", False))
+        heartbeat = float(self.config.get("heartbeat_interval", 1.0))
+        last_message: "dict | None" = None
+        last_broadcast = 0.0
+        client_tasks = self.client_tasks
+        frame_event = self._frame_event
+        build_message = self._build_message
+        poll_sensors = self._poll_reachable_sensors
+        debug = self.logger.debug
+        sleep = asyncio.sleep
+        loop_time = asyncio.get_running_loop().time
+        next_tick = loop_time()
+        next_poll = next_tick
+        message: "dict | None" = None
+        try:
+            while True:
+                udp = self._udp_publisher
+                if client_tasks or (udp is not None and udp.subscribers):
+                    # Same absolute-deadline scheme as the tick pacing so a
+                    # slow poll doesn't push every later poll back; with the
+                    # default poll_delay == send_delay this fires every tick.
+                    if message is None or poll_delay <= send_delay or loop_time() >= next_poll:
+                        if self.test_mode:
+                            message = {
+                                self.sensor_name_by_id.get(sensor_id, sensor_id): 2 + random.uniform(-0.2, 0.2)
+                                for sensor_id in self.test_sensor_ids
+                            }
+                        else:
+                            message = await poll_sensors()
+                        next_poll += poll_delay
+                        now = loop_time()
+                        if next_poll <= now:
+                            next_poll = now + poll_delay
+
+                    if (
+                        dedup
+                        and message == last_message
+                        and loop_time() - last_broadcast < heartbeat
+                    ):
+                        # Unchanged payload inside the heartbeat window;
+                        # nothing to encode or send this tick.
+                        pass
+                    else:
+                        # %-style args defer formatting until a handler
+                        # accepts the record, so this is free when DEBUG
+                        # is off.
+                        debug("Broadcasting sensor_data -> %s", message)
+                        frame = build_message("sensor_data", message)
+                        self._latest_frame = frame
+                        # Binary-mode clients read their own frame slot; it
+                        # is only encoded while one is actually connected.
+                        if self._wire_format == "raw":
+                            self._latest_raw_frame = frame
+                        elif self._binary_clients:
+                            self._latest_raw_frame = self._build_raw_frame(message)
+                        # set() wakes every waiting client handler; clear()
+                        # immediately re-arms the event for the next tick.
+                        frame_event.set()
+                        frame_event.clear()
+                        if udp is not None:
+                            udp.publish(frame)
+                        last_message = message
+                        last_broadcast = loop_time()
+
+                next_tick += send_delay
+                now = loop_time()
+                if next_tick <= now:
+                    # Fell behind (slow sensor poll); skip the missed ticks
+                    # rather than bursting to catch up.
+                    next_tick = now + send_delay
+                await sleep(next_tick - now)
+        except asyncio.CancelledError:
+            self.logger.info("Producer loop cancelled.")
+            raise
+        except Exception as e:
+            self.logger.error(f"Producer loop failed: {e}", exc_info=True)
+            raise
+
+    def _envelope_prefix(self, message_type: str) -> bytes:
+        # The {"message_type": ..., "payload": ...} envelope is constant per
+        # message type; only the payload changes between ticks. Precompute the
+        # skeleton once so the hot path serializes just the payload.
+        prefix = self._envelope_prefixes.get(message_type)
+        if prefix is None:
+            prefix = b'{"message_type":"' + message_type.encode("utf-8") + b'","payload":'
+            self._envelope_prefixes[message_type] = prefix
+        return prefix
+
+    def _build_raw_frame(self, payload: dict) -> bytes:
+        # Tightest encoding for the periodic stream: one little-endian
+        # double per sensor (NaN for unreachable), 2-byte big-endian
+        # length prefix. Field order follows sensors_config, which
+        # clients learn from the sensor_config reply (still JSON).
+        order = self._raw_field_order
+        if order is None:
+            order = tuple(self.sensor_name_by_id.values()) or tuple(payload)
+            self._raw_field_order = order
+        values = [
+            math.nan if (v := payload.get(name)) is None else float(v)
+            for name in order
+        ]
+        body = struct.pack(f"<{len(values)}d", *values)
+        return len(body).to_bytes(2, "big") + body
 
-    def _is_sensor_config_request(self, raw_message: str) -> bool:
+    def _build_message(self, message_type: str, payload: dict) -> bytes:
+        if self._wire_format == "raw" and message_type == "sensor_data":
+            return self._build_raw_frame(payload)
+
+        if self._wire_format == "msgpack":
+            # msgpack frames are length-prefixed (2-byte big-endian) instead
+            # of newline-terminated so clients read exact frames without
+            # scanning for a delimiter.
+            body = msgpack.packb({"message_type": message_type, "payload": payload})
+            if len(body) > 0xFFFF:
+                raise ValueError(f"msgpack frame too large: {len(body)} bytes")
+            return len(body).to_bytes(2, "big") + body
+
+        # orjson emits UTF-8 bytes directly (non-ASCII preserved, like
+        # ensure_ascii=False), skipping the intermediate str + .encode() pass.
+        # This runs once per send tick per client, so it matters at 100 Hz.
+        if orjson is not None:
+            payload_bytes = orjson.dumps(payload)
+        else:
+            payload_bytes = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        # join() builds the frame in one allocation; chained + would create
+        # an intermediate bytes object for the prefix+payload step.
+        return b"".join((self._envelope_prefix(message_type), payload_bytes, b"}\n"))
+
+    def _is_sensor_config_request(self, raw_message: "bytes | str") -> bool:
+        # Accepts raw bytes straight off the wire; json.loads handles UTF-8
+        # bytes natively, so the control channel never pays a str decode.
+        if isinstance(raw_message, str):
+            raw_message = raw_message.encode("utf-8")
         message = raw_message.strip()
         if not message:
             return False
-        if message.upper() in {"GET_SENSOR_CONFIG", "REQUEST_SENSOR_CONFIG"}:
+        if message.upper() in {b"GET_SENSOR_CONFIG", b"REQUEST_SENSOR_CONFIG"}:
             return True
         try:
-            parsed = json.loads(message)
-        except json.JSONDecodeError:
+            parsed = orjson.loads(message) if orjson is not None else json.loads(message)
+        except (ValueError, UnicodeDecodeError):
+            # ValueError covers json.JSONDecodeError and orjson.JSONDecodeError.
             return False
         if not isinstance(parsed, dict):
             return False
@@ -190,9 +491,108 @@ class PiServer:
         action = str(parsed.get("action", "")).lower()
         return message_type in {"get_sensor_config", "request_sensor_config"} or action == "get_sensor_config"
 
+    async def _send_loop(self, peer_addr, send_bytes, state):
+        # Defined at class level so the function object is built once, not
+        # re-created as a closure on every accepted connection.
+        # The producer task polls sensors and serializes one sensor_data
+        # frame per tick for all clients; this loop only forwards the
+        # latest frame, so per-client work is a single write.
+        # send_batch > 1 coalesces that many ticks into one write+drain,
+        # amortizing syscall and flow-control overhead at the cost of up
+        # to (send_batch - 1) * send_delay extra latency. Frames stay
+        # newline-delimited, so clients parse the stream unchanged.
+        batch_size = max(1, int(self.config.get("send_batch", 1)))
+        # Optional cap on how long a partial batch may sit before it is
+        # flushed anyway, bounding worst-case latency independently of
+        # batch size (e.g. when the producer idles between clients).
+        batch_interval_ms = self.config.get("send_batch_interval_ms")
+        batch_interval = float(batch_interval_ms) / 1000.0 if batch_interval_ms else None
+        # Byte-size cap alongside the frame-count cap: flush once the buffer
+        # is big enough to fill a TCP segment economically, whichever limit
+        # trips first, so large frames don't accumulate send_batch * size
+        # bytes before hitting the wire.
+        batch_max_bytes = int(self.config.get("send_batch_max_bytes", 1024))
+        batch = bytearray()
+        batched = 0
+        loop = asyncio.get_running_loop()
+        last_flush = loop.time()
+        frame_wait = self._frame_event.wait
+        try:
+            while True:
+                await frame_wait()
+                frame = self._latest_raw_frame if state["binary"] else self._latest_frame
+                if frame is None:
+                    continue
+                if batch_size == 1:
+                    await send_bytes(frame)
+                else:
+                    batch += frame
+                    batched += 1
+                    if (
+                        batched >= batch_size
+                        or len(batch) >= batch_max_bytes
+                        or (batch_interval is not None and loop.time() - last_flush >= batch_interval)
+                    ):
+                        # Flush an immutable snapshot: uvloop's transport
+                        # keeps a zero-copy buffer export when the write
+                        # can't complete immediately, so handing over the
+                        # bytearray and clear()ing it raises BufferError
+                        # under backpressure. One bytes() copy per flush is
+                        # the price of reusing the accumulation buffer.
+                        await send_bytes(bytes(batch))
+                        batch.clear()
+                        batched = 0
+                        last_flush = loop.time()
+        except (ConnectionResetError, BrokenPipeError, TimeoutError, OSError) as e:
+            self.logger.warning("Client %s disconnected: %s", peer_addr, e)
+            raise
+        except asyncio.CancelledError:
+            self.logger.info("Send loop cancelled.")
+            raise
+        except Exception as e:
+            # No exc_info here: formatting a traceback per failure is an
+            # allocation storm when a disconnect floods the 100 Hz loop, and
+            # the exception type/message already identify the cause.
+            self.logger.error("Unexpected send error to %s: %s", peer_addr, e)
+            raise
+
+    async def _receive_loop(self, reader: asyncio.StreamReader, peer_addr, send_message, state):
+        try:
+            while True:
+                data = await reader.readline()
+                if not data:
+                    self.logger.info("Client %s has disconnected", peer_addr)
+                    raise ClientDisconnected(str(peer_addr))
+                # Stay in bytes: strip is a view-sized copy at most and
+                # %r renders bytes fine, so no decode per message.
+                message = data.strip()
+                self.logger.info("Received from %s: %r", peer_addr, message)
+                if message.upper() == b"BINARY":
+                    # Per-client opt-in to the raw struct-packed frames (see
+                    # _build_raw_frame); control replies stay JSON.
+                    if not state["binary"]:
+                        state["binary"] = True
+                        self._binary_clients += 1
+                    self.logger.info("Client %s switched to binary frames", peer_addr)
+                elif self._is_sensor_config_request(message):
+                    await send_message("sensor_config", self.sensor_config_data)
+                    self.logger.info("Sent sensor_config to %s", peer_addr)
+        except ClientDisconnected:
+            # Clean EOF, already logged above; just unwind the TaskGroup.
+            raise
+        except (ConnectionResetError, BrokenPipeError, TimeoutError, OSError) as e:
+            self.logger.warning("Client %s disconnected: %s", peer_addr, e)
+            raise
+        except asyncio.CancelledError:
+            self.logger.info("Receive loop cancelled.")
+            raise
+        except Exception as e:
+            self.logger.error("Error receiving from %s: %s", peer_addr, e)
+            raise
+
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         peer_addr = writer.get_extra_info("peername")
-        self.logger.info(f"Accepting connection from {peer_addr}")
+        self.logger.info("Accepting connection from %s", peer_addr)
 
         # Detect silent disconnects (IP change, cable unplug, crash) without waiting
         # for Linux's default ~15-minute TCP retransmit timeout. TCP_USER_TIMEOUT tells
@@ -206,92 +606,94 @@ class PiServer:
             except OSError:
                 pass
 
+        # Small frames at 100 Hz must not sit in Nagle's buffer waiting for an
+        # ACK. asyncio enables TCP_NODELAY on its transports since 3.6, but
+        # set it explicitly so the latency guarantee doesn't depend on the
+        # event loop implementation. TCP_QUICKACK (Linux-only) additionally
+        # disables delayed ACKs on this connection.
+        if sock:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+            _tcp_quickack = getattr(socket, "TCP_QUICKACK", None)
+            if _tcp_quickack is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, _tcp_quickack, 1)
+                except OSError:
+                    pass
+            # Optional kernel send-buffer size: a larger SO_SNDBUF lets the
+            # kernel absorb bursts (e.g. batch flushes over a slow link)
+            # before the transport buffer fills and drain() has to wake the
+            # loop. Left to the kernel's auto-tuning unless configured.
+            so_sndbuf = self.config.get("so_sndbuf")
+            if so_sndbuf:
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, int(so_sndbuf))
+                except OSError:
+                    pass
+
         write_lock = asyncio.Lock()
 
-        async def send_message(message_type: str, payload: dict):
-            data_to_send = self._build_message(message_type, payload)
+        # drain() only suspends once the transport buffer crosses its
+        # high-water mark, so awaiting it after every tiny frame is a wasted
+        # scheduler round-trip per tick. Write unconditionally and drain only
+        # when the buffer has actually grown past the threshold; the kernel
+        # and transport buffers absorb the rest.
+        drain_threshold = int(self.config.get("drain_high_water", 64 * 1024))
+        transport = writer.transport
+        try:
+            # Keep the transport's own flow-control marks in step with the
+            # drain threshold so that when we do await drain(), it actually
+            # pauses until the buffer has emptied back to the low mark.
+            transport.set_write_buffer_limits(high=drain_threshold, low=drain_threshold // 4)
+        except (AttributeError, NotImplementedError):
+            pass
+
+        async def send_bytes(data_to_send: bytes):
             async with write_lock:
+                if writer.is_closing():
+                    raise ConnectionResetError("client connection is closing")
                 writer.write(data_to_send)
-                await asyncio.wait_for(writer.drain(), timeout=self.config.get("drain_timeout", 5.0))
+                if transport.get_write_buffer_size() > drain_threshold:
+                    await asyncio.wait_for(writer.drain(), timeout=self._drain_timeout)
+
+        async def send_message(message_type: str, payload: dict):
+            await send_bytes(self._build_message(message_type, payload))
 
         current_task = asyncio.current_task()
         if current_task:
             self.client_tasks.add(current_task)
 
-        async def send_loop():
-            try:
-                while True:
-                    if self.test_mode:
-                        message = {
-                            self.sensor_name_by_id.get(sensor_id, sensor_id): 2 + random.uniform(-0.2, 0.2)
-                            for sensor_id in self.test_sensor_ids
-                        }
-                    else:
-                        message = await self._poll_reachable_sensors()
-
-                    self.logger.debug(f"Sending sensor_data to {peer_addr} -> {message}")
-                    await send_message("sensor_data", message)
-                    await asyncio.sleep(self.config.get("send_delay", 0.01))
-            except (ConnectionResetError, BrokenPipeError, TimeoutError, OSError) as e:
-                self.logger.warning(f"Client {peer_addr} disconnected: {e}")
-                raise
-            except asyncio.CancelledError:
-                self.logger.info("Send loop cancelled.")
-                raise
-            except Exception as e:
-                self.logger.error(f"Unexpected send error to {peer_addr}: {e}", exc_info=True)
-                raise
-
-        async def receive_loop():
-            try:
-                while True:
-                    data = await reader.readline()
-                    if not data:
-                        self.logger.info(f"Client {peer_addr} has disconnected")
-                        break
-                    message = data.decode("utf-8", errors="ignore").strip()
-                    self.logger.info(f"Received from {peer_addr}: {message!r}")
-                    if self._is_sensor_config_request(message):
-                        await send_message("sensor_config", self.sensor_config_data)
-                        self.logger.info(f"Sent sensor_config to {peer_addr}")
-            except (ConnectionResetError, BrokenPipeError, TimeoutError, OSError) as e:
-                self.logger.warning(f"Client {peer_addr} disconnected: {e}")
-                raise
-            except asyncio.CancelledError:
-                self.logger.info("Receive loop cancelled.")
-                raise
-            except Exception as e:
-                self.logger.error(f"Error receiving from {peer_addr}: {e}", exc_info=True)
-                raise
+        # Shared between the two loops: the receive side flips "binary" on
+        # handshake and the send side picks the matching frame slot.
+        state = {"binary": False}
 
-        send_task = None
-        receive_task = None
         try:
-            send_task = asyncio.create_task(send_loop())
-            receive_task = asyncio.create_task(receive_loop())
-            await asyncio.wait([send_task, receive_task], return_when=asyncio.FIRST_COMPLETED)
+            # TaskGroup cancels the sibling loop as soon as either one
+            # raises, replacing the manual create_task/wait/cancel/gather
+            # bookkeeping (and its per-task weakref callbacks).
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._send_loop(peer_addr, send_bytes, state))
+                tg.create_task(self._receive_loop(reader, peer_addr, send_message, state))
         except asyncio.CancelledError:
-            self.logger.info(f"Connection handler for {peer_addr} cancelled.")
-        except Exception as e:
-            self.logger.error(f"Handler exception: {e}")
+            self.logger.info("Connection handler for %s cancelled.", peer_addr)
+        except BaseExceptionGroup as eg:
+            # Disconnect-class errors are already logged by the loops.
+            _, rest = eg.split((ClientDisconnected, ConnectionResetError, BrokenPipeError, TimeoutError, OSError))
+            if rest is not None:
+                self.logger.error("Handler exception: %s", rest.exceptions)
         finally:
-            for task in [send_task, receive_task]:
-                if task and not task.done():
-                    task.cancel()
-            if send_task or receive_task:
-                await asyncio.gather(send_task, receive_task, return_exceptions=True)
-
             writer.close()
             try:
-                await asyncio.wait_for(
-                    writer.wait_closed(),
-                    timeout=self.config.get("drain_timeout", 5.0),
-                )
+                await asyncio.wait_for(writer.wait_closed(), timeout=self._drain_timeout)
             except Exception:
                 pass
 
             if current_task:
                 self.client_tasks.discard(current_task)
+            if state["binary"]:
+                self._binary_clients -= 1
 
     async def _shutdown(self, sig: signal.Signals):
         if self._is_shutting_down:
@@ -301,9 +703,21 @@ class PiServer:
         sig_name = sig.name if sig else "UNKNOWN"
         self.logger.info(f"Received signal: {sig_name}. Shutting down.")
 
-        # Stop accepting new connections first.
+        # Stop accepting new connections first. The serve task is cancelled
+        # explicitly because Server.close() alone does not end
+        # serve_forever() on every event loop (uvloop in particular).
         if self.server:
             self.server.close()
+        if self._serve_task is not None and not self._serve_task.done():
+            self._serve_task.cancel()
+
+        if self._producer_task and not self._producer_task.done():
+            self._producer_task.cancel()
+            await asyncio.gather(self._producer_task, return_exceptions=True)
+
+        if self._udp_publisher is not None:
+            self._udp_publisher.close()
+            self._udp_publisher = None
 
         # Cancel client handlers before server.wait_closed(): wait_closed() blocks
         # until all _handle_client coroutines return, so tasks must be cancelled first.
@@ -315,16 +729,59 @@ class PiServer:
 
         if self.server:
             try:
-                await self.server.wait_closed()
+                # Bounded: a handler stuck in cleanup must not hang the whole
+                # shutdown (systemd would otherwise escalate to SIGKILL).
+                await asyncio.wait_for(self.server.wait_closed(), timeout=2.0)
             except Exception:
                 pass
+
+        # Release sensor hardware: TCP links, the Modbus serial port and the
+        # GPIO encoder pins. Sensors can share a gateway, so dedupe by id.
+        closed: set[int] = set()
+        for sensor in self.sensors.values():
+            gateway = getattr(sensor, "gateway", None)
+            if gateway is None or id(gateway) in closed:
+                continue
+            closed.add(id(gateway))
+            try:
+                gateway.close()
+            except Exception as e:
+                self.logger.warning("Failed to close gateway %r: %s", gateway, e)
+
         self.logger.info("Shutdown complete.")
+        if self._log_listener is not None:
+            # Flush queued records and stop the listener thread last so the
+            # shutdown messages above still reach the output. Swap the
+            # listener's real handlers back onto the loggers in place of the
+            # QueueHandler: anything logged after this point (e.g. main()'s
+            # farewell) would otherwise sit in a queue nobody drains.
+            listener = self._log_listener
+            self._log_listener = None
+            listener.stop()
+            queue_handler = self._queue_handler
+            if queue_handler is not None:
+                self._queue_handler = None
+                for target in (logging.getLogger(), self.logger):
+                    if queue_handler in target.handlers:
+                        target.removeHandler(queue_handler)
+                        for handler in listener.handlers:
+                            target.addHandler(handler)
+
+    def _on_signal(self, sig: signal.Signals):
+        # Bound method registered directly with add_signal_handler (which
+        # forwards extra args), so no lambda/default-arg closure per signal.
+        # The task is kept so run()'s finally can await the full shutdown:
+        # _shutdown cancels the serve task, which unblocks run() while this
+        # task is still mid-flight, and asyncio.run would otherwise cancel
+        # it at its next await point.
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.ensure_future(self._shutdown(sig))
 
     async def run(self):
         loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
             try:
-                loop.add_signal_handler(sig, lambda s=sig: asyncio.create_task(self._shutdown(s)))
+                loop.add_signal_handler(sig, self._on_signal, sig)
             except NotImplementedError:
                 # Windows ProactorEventLoop does not support add_signal_handler.
                 self.logger.debug("Signal handlers are not supported on this platform/event loop.")
@@ -332,20 +789,53 @@ class PiServer:
 
         self._initialize_sensors()
 
+        self._frame_event = asyncio.Event()
+        self._producer_task = asyncio.create_task(self._producer())
+
         host = self.config.get("host", "0.0.0.0")
         port = self.config.get("port", 10001)
 
+        udp_port = self.config.get("udp_port")
+        if udp_port:
+            try:
+                _, self._udp_publisher = await loop.create_datagram_endpoint(
+                    lambda: TelemetryPublisher(
+                        self.logger,
+                        ttl=float(self.config.get("udp_subscriber_ttl", 30.0)),
+                    ),
+                    local_addr=(host, int(udp_port)),
+                )
+                self.logger.info(f"UDP telemetry listening on {(host, int(udp_port))}")
+            except OSError as e:
+                self.logger.error(f"Failed to start UDP telemetry on port {udp_port}: {e}")
+
         try:
-            self.server = await asyncio.start_server(self._handle_client, host, port)
+            # The inbound channel only ever carries short one-line control
+            # requests; a small reader limit caps per-connection buffer
+            # growth if a client streams garbage without newlines.
+            read_limit = int(self.config.get("read_limit", 4096))
+            self.server = await asyncio.start_server(self._handle_client, host, port, limit=read_limit)
             addrs = ", ".join(str(sock.getsockname()) for sock in self.server.sockets)
             self.logger.info(f"Server listening on {addrs}")
-            await self.server.serve_forever()
+            # Hold the serving task so _shutdown can cancel it explicitly:
+            # uvloop's Server.close() does not unwind serve_forever() the
+            # way the stdlib loop does, and relying on close() alone leaves
+            # run() blocked here forever after a signal.
+            self._serve_task = asyncio.ensure_future(self.server.serve_forever())
+            await self._serve_task
         except asyncio.CancelledError:
             pass
         except Exception as e:
             self.logger.error(f"Server exception: {e}", exc_info=True)
         finally:
-            await self._shutdown(None)
+            if self._shutdown_task is not None:
+                # Signal path: _shutdown is already running as a task and
+                # re-entering here would return immediately on the
+                # idempotence guard, leaving the real cleanup to be
+                # cancelled by asyncio.run. Wait for it to finish instead.
+                await self._shutdown_task
+            else:
+                await self._shutdown(None)
 
 
 def main():
@@ -369,6 +859,19 @@ def main():
     args = parser.parse_args()
 
     server_app = PiServer(args.config_file, test_mode=args.test)
+
+    # uvloop's libuv-based loop roughly halves per-write/scheduling overhead
+    # for small-message TCP workloads; everything above asyncio's API is
+    # unchanged. Opt out with "use_uvloop": false in the config.
+    if server_app.config.get("use_uvloop", True):
+        try:
+            import uvloop
+        except ImportError:
+            server_app.logger.debug("uvloop not installed, using default event loop.")
+        else:
+            uvloop.install()
+            server_app.logger.info("Using uvloop event loop.")
+
     try:
         asyncio.run(server_app.run())
     except (KeyboardInterrupt, SystemExit):
@@ -1,9 +1,10 @@
 from gpiozero import RotaryEncoder
 import logging
 import sys
+import time
 
 class MeterCountWorker:
-    """This class reads the step of a rotary encoder. It takes in the pin_number on Raspberry Pi which connect to the output of the encoder, and the diameter of the wheel, and updates its internal variable self.meter_count."""
+    """This class reads the step of a rotary encoder. It takes in the pin_number on Raspberry Pi which connect to the output of the encoder, and the diameter of the wheel, and updates its internal variable self.meter_count. Updates are driven by gpiozero's when_rotated callback, so no thread sits blocked in a wait loop."""
     def __init__(self, PIN_A, PIN_B, print=False, logger=None):
         self.meter_count = 0 # the variable, mm
         self.encoder = RotaryEncoder(PIN_A, PIN_B, max_steps=0)
@@ -11,16 +12,26 @@ class MeterCountWorker:
 
         self.logger = logger or logging.getLogger(__name__)
 
+        # 事件驱动：gpiozero 在它自己的引脚线程里触发回调，
+        # 不需要再用 wait_for_rotate() 阻塞一个线程轮询。
+        self.encoder.when_rotated = self._on_rotate
+
+    def _on_rotate(self):
+        self.meter_count = self.encoder.steps
+        if self.print:
+            self.logger.debug("当前步数：%s", self.meter_count)
+
     def run(self):
+        # 保留作为命令行调试入口；计数本身由回调更新。
         try:
             while True:
-                self.encoder.wait_for_rotate()
-                self.meter_count = self.encoder.steps 
-                if self.print:
-                    self.logger.debug(f"当前步数：{self.meter_count}")
+                time.sleep(1)
         except KeyboardInterrupt:
             self.logger.info("程序退出。")
-        
+
+    def close(self):
+        self.encoder.close()
+
 
 if __name__ == "__main__":
 
@@ -31,10 +42,7 @@ if __name__ == "__main__":
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[logging.StreamHandler(sys.stdout)] # 确保输出到 stdout
     )
-    PIN_A = 17 
+    PIN_A = 17
     PIN_B = 18
     mcw = MeterCountWorker(17, 18, print=True)
     mcw.run()
-            
-
-    
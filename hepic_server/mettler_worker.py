@@ -1,41 +1,56 @@
 import logging
 import asyncio
+import re
 
 class MettlerWorker:
     """Grab weight data from the Mettler loadcell and store realtime data as a local variable."""
-    def __init__(self, ip, port=1026, frequency=100, logger=None):
+
+    # SI 响应格式: S Sts Gross Unit。预编译的 bytes 正则只取 gross 字段，
+    # 采集循环里无需 decode / split / 构造 dict。
+    _SIX1_RE = re.compile(rb"^\s*S\s+(\S+)\s+(\S+)\s+(\S+)")
+
+    def __init__(self, ip, port=1026, frequency=100, logger=None, continuous=False):
         self.ip = ip
         self.port = port
         self.command = "SI\r\n"
+        self._command_bytes = self.command.encode("ascii")  # 预编码，避免每个周期都 encode
         self.frequency = frequency
+        # continuous=True 时改用 SIR 连续输出模式：只发一次命令，
+        # 仪表自行按内部速率推送数据，省掉每个采样周期的请求半程 RTT。
+        self.continuous = continuous
         self.is_running = False
         self.weight = float("nan")
         self.logger = logger or logging.getLogger("MettlerWorker") # 使用传入的 logger
         self.writer = None
 
     async def run(self):
-        
+
         try:
             self.is_running = True
             self.logger.info(f"Opening connection to {self.ip}: {self.port}")
             reader, self.writer = await asyncio.wait_for(
-                asyncio.open_connection(self.ip, self.port), 
+                asyncio.open_connection(self.ip, self.port),
                 timeout=2.0
             )
+            if self.continuous:
+                await self._run_continuous(reader)
+                return
             while self.is_running:
                 self.logger.debug(f"send \"{self.command.strip()}\" to {self.ip}: {self.port}")
-                self.writer.write(self.command.encode("ascii"))
+                self.writer.write(self._command_bytes)
                 await self.writer.drain()
+                # readuntil 按 CRLF 精确取一条响应：粘包/拆包都不会错位，
+                # 解析端也始终拿到完整的一帧 bytes。
                 response_bytes = await asyncio.wait_for(
-                    reader.read(1024), 
+                    reader.readuntil(b"\r\n"),
                     timeout=2.0
                 )
-                response_str = response_bytes.decode("ascii")
-                self.logger.debug(f"Get response: {response_str}")
-                weight_data = self.parse_six1_response(response_str)
-                self.weight = weight_data["gross"]
+                self.logger.debug("Get response: %s", response_bytes)
+                gross = self._parse_gross(response_bytes)
+                if gross is not None:
+                    self.weight = gross
                 await asyncio.sleep(1 / self.frequency)
-        except (asyncio.TimeoutError, ConnectionRefusedError) as e:
+        except (asyncio.TimeoutError, ConnectionRefusedError, asyncio.IncompleteReadError) as e:
             # 连接失败不应该让整个服务崩溃
             self.logger.error(f"Failed to connect to Mettler {self.ip}: {e}")
         except asyncio.CancelledError:
@@ -45,6 +60,35 @@ class MettlerWorker:
         finally:
             self.logger.info("Mettler worker closed.")
 
+    async def _run_continuous(self, reader):
+        """SIR 连续模式：仪表主动推送，循环里只有 readuntil + 解析，
+        没有写命令、没有 drain、也没有 sleep。"""
+        self.logger.info(f"Starting SIR continuous mode on {self.ip}: {self.port}")
+        self.writer.write(b"SIR\r\n")
+        await self.writer.drain()
+        parse_gross = self._parse_gross
+        readuntil = reader.readuntil
+        while self.is_running:
+            response_bytes = await asyncio.wait_for(
+                readuntil(b"\r\n"),
+                timeout=2.0
+            )
+            gross = parse_gross(response_bytes)
+            if gross is not None:
+                self.weight = gross
+
+    def _parse_gross(self, response_bytes):
+        """采集热路径：用预编译正则直接从 bytes 中取毛重，失败返回 None。"""
+        m = self._SIX1_RE.match(response_bytes)
+        if m is None:
+            self.logger.debug("错误：收到了意外的响应格式: %r", response_bytes)
+            return None
+        try:
+            return float(m.group(2))
+        except ValueError as e:
+            self.logger.error("错误：解析响应时出错: %s\n原始响应: %r", e, response_bytes)
+            return None
+
     def parse_six1_response(self, response_str):
         """
         解析 SI 命令的响应字符串。
@@ -74,6 +118,13 @@ class MettlerWorker:
         self.logger.info("Setting is_running to False")
         self.is_running = False
         if self.writer: # make sure connection has been established once
+            if self.continuous:
+                # @ 命令让仪表停止 SIR 推送，再关连接
+                try:
+                    self.writer.write(b"@\r\n")
+                    await self.writer.drain()
+                except (OSError, ConnectionResetError):
+                    pass
             self.logger.info("closing writer")
             self.writer.close()
             self.logger.info("waiting writer to close")
@@ -31,29 +31,31 @@ class MettlerSensor(SensorBase):
         self.logger = logging.getLogger(__name__)
 
     async def get_value(self) -> float | None:
-        self.logger.debug(f"Sending command to Mettler sensor: {self.command.hex()}")
+        self.logger.debug("Sending command to Mettler sensor: %s", self.command.hex())
         raw_data = await self.gateway.exchange(self.command)
 
         if raw_data is None:
             self.logger.warning("No response received from Mettler sensor")
             return None
-        if isinstance(raw_data, bytes):
-            response_str = raw_data.decode("ascii", errors="ignore")
-        else:
-            response_str = str(raw_data)
-        self.logger.debug(f"Received response from Mettler sensor: {raw_data!r}")
-
-        return self.parse_six1_response(response_str)
-
-    def parse_six1_response(self, response_str: str) -> float | None:
-        parts = response_str.strip().split()
-        if len(parts) < 4 or parts[0] != "S":
-            self.logger.debug(f"Unexpected Mettler response: {response_str!r}")
+        if not isinstance(raw_data, bytes):
+            raw_data = str(raw_data).encode("ascii", errors="ignore")
+        self.logger.debug("Received response from Mettler sensor: %r", raw_data)
+
+        return self.parse_six1_response(raw_data)
+
+    def parse_six1_response(self, response: "bytes | str") -> float | None:
+        # Parses the raw response bytes directly; this runs once per poll
+        # tick, and float() accepts ASCII bytes, so no str decode is needed.
+        if isinstance(response, str):
+            response = response.encode("ascii", errors="ignore")
+        parts = response.split()
+        if len(parts) < 4 or parts[0] != b"S":
+            self.logger.debug("Unexpected Mettler response: %r", response)
             return None
         try:
             return float(parts[self.weight_position]) * 9.81
         except (IndexError, ValueError) as e:
-            self.logger.error(f"Failed to parse Mettler response: {e}; raw={response_str!r}")
+            self.logger.error("Failed to parse Mettler response: %s; raw=%r", e, response)
             return None
 
 
@@ -1,58 +1,72 @@
-import websockets
 import asyncio
+import logging
 import sys
 
+logger = logging.getLogger("MockSensor")
+
+# Constant SI reply, encoded once at import instead of per response.
+_MOCK_REPLY = b"S S 0.0072 kg\n"
+
 class MockSensor:
 
     def __init__(self):
         self.is_running = False
         self.host = "0.0.0.0"
         self.port = 1026
-        self.message_queue = asyncio.Queue()
+        # Only the most recent command matters, so a single slot plus an
+        # Event replaces the queue: no per-message put/get allocations.
+        self._cmd_ready = asyncio.Event()
+        self._last_cmd = ""
         self.tasks = set()
+        self.logger = logger
     
     async def _handle_client(self, reader, writer):
         
         addr = writer.get_extra_info('peername')
-        print(f"accept connection from {addr}")
+        self.logger.info("accept connection from %s", addr)
 
-        shutdown_signal = asyncio.Future()
+        # asyncio.Event instead of a polled Future: loops check is_set()
+        # and the handler body blocks on wait(), so shutdown wakes everything
+        # immediately instead of on the next loop iteration.
+        shutdown_event = asyncio.Event()
 
         async def send_loop():
             try:
-                while not shutdown_signal.done():
-                    message = await self.message_queue.get()
-                    
+                while not shutdown_event.is_set():
+                    await self._cmd_ready.wait()
+                    self._cmd_ready.clear()
+                    message = self._last_cmd
+
                     if message == "SI":
-                        print(message)
-                        writer.write("S S 0.0072 kg\n".encode("utf-8"))
+                        # lazy %-formatting: no string built unless DEBUG on
+                        self.logger.debug("%s", message)
+                        writer.write(_MOCK_REPLY)
                         
             except ConnectionResetError:
                 # 这是关键：捕获错误
-                print(f"Client {addr} forcibly closed connection (Connection reset).")
+                self.logger.warning("Client %s forcibly closed connection (Connection reset).", addr)
             except Exception as e:
-                self.logger.error(f"error when receiving from {addr}: {e}", exc_info=True)
-                if not shutdown_signal.done():
-                    shutdown_signal.set_result(True)
+                self.logger.error(f"error when sending to {addr}: {e}", exc_info=True)
+                shutdown_event.set()
 
         async def recv_loop():
             try:
-                while not shutdown_signal.done():
+                while not shutdown_event.is_set():
                         data = await reader.read(1024)
                         if not data:
-                            # self.logger.info(f"client {addr} has disconnected")
-                            if not shutdown_signal.done():
-                                shutdown_signal.set_result(True)
+                            self.logger.info("client %s has disconnected", addr)
+                            shutdown_event.set()
+                            break  # EOF: stop immediately, don't process empty data
                         message = data.decode().strip()
-                        print(f"received from {addr}: {message!r}")
-                        await self.message_queue.put(message)
+                        self.logger.debug("received from %s: %r", addr, message)
+                        self._last_cmd = message
+                        self._cmd_ready.set()
             except ConnectionResetError:
                 # 这是关键：捕获错误
-                print(f"Client {addr} forcibly closed connection (Connection reset).")
+                self.logger.warning("Client %s forcibly closed connection (Connection reset).", addr)
             except Exception as e:
                 self.logger.error(f"error when receiving from {addr}: {e}", exc_info=True)
-                if not shutdown_signal.done():
-                    shutdown_signal.set_result(True)
+                shutdown_event.set()
 
         send_task = asyncio.create_task(send_loop())
         recv_task = asyncio.create_task(recv_loop())
@@ -60,28 +74,29 @@ class MockSensor:
         self.tasks.add(send_task)
         self.tasks.add(recv_task)
 
-        await shutdown_signal
+        await shutdown_event.wait()
 
         send_task.cancel()
         recv_task.cancel()
         self.tasks.remove(send_task)
         self.tasks.remove(recv_task)
 
-        print(f"connection closed")
+        self.logger.info("connection closed")
         writer.close()
         await writer.wait_closed()
 
     async def _shutdown(self, sig):
-        print(f"receive close signal: closing")
+        self.logger.info("receive close signal: closing")
 
     async def run(self):
         try:
             self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
             await self.server.serve_forever()
         except Exception as e:
-            print(f"server fails to start, {e}")
+            self.logger.error(f"server fails to start, {e}")
             sys.exit(1)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
     server_app = MockSensor()
     asyncio.run(server_app.run())
\ No newline at end of file
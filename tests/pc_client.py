@@ -1,6 +1,11 @@
 import asyncio
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class TCPClient:
     def __init__(self, host: str, port: int):
@@ -36,14 +41,16 @@ class TCPClient:
                     self.is_running = False
                     break
 
-                message_str = data.decode("utf-8").strip()
-                if not message_str:
+                stripped = data.strip()
+                if not stripped:
                     continue
 
                 try:
-                    message = json.loads(message_str)
-                except json.JSONDecodeError:
-                    print(f"Invalid JSON from server: {message_str}")
+                    # orjson parses the raw bytes directly, skipping the
+                    # per-line decode; stdlib json is the fallback.
+                    message = orjson.loads(stripped) if orjson is not None else json.loads(stripped)
+                except ValueError:
+                    print(f"Invalid JSON from server: {stripped!r}")
                     continue
 
                 if not isinstance(message, dict):
@@ -72,7 +79,10 @@ class TCPClient:
         if not self.is_running or not self.writer:
             print("Connection not established.")
             return
-        data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        if orjson is not None:
+            data = orjson.dumps(message) + b"\n"
+        else:
+            data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
         self.writer.write(data)
         await self.writer.drain()
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Signal-shutdown tests exercising the real run() path: the server is
+started in a subprocess under asyncio.run, receives SIGTERM, and must
+exit cleanly within a timeout with full cleanup. Run under both the
+stdlib event loop and uvloop — Server.close() does not unwind
+serve_forever() on uvloop, which is exactly the hang these tests guard
+against.
+
+Usage:
+    python tests/test_shutdown.py
+"""
+
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_SERVER_SCRIPT = textwrap.dedent(
+    """
+    import asyncio, json, os, signal, sys, tempfile
+    from pathlib import Path
+
+    sys.path.insert(0, {repo_root!r})
+    if {use_uvloop!r} == "uvloop":
+        import uvloop
+        uvloop.install()
+    from hepic_server.hepic_server import PiServer
+    from hepic_server.gateway import TCPGateway
+
+    tmp = Path(tempfile.mkdtemp())
+    config = {{
+        "sensors_config_path": str(Path({repo_root!r}) / "sensors_config.yaml"),
+        "port": {port},
+    }}
+    (tmp / "config.json").write_text(json.dumps(config))
+
+    server = PiServer(str(tmp / "config.json"), test_mode=True)
+
+    # Fake sensor whose gateway records close() so the parent can assert
+    # that hardware cleanup ran on the signal path.
+    class FakeSensor:
+        pass
+
+    fake = FakeSensor()
+    fake.gateway = TCPGateway("127.0.0.1", 1)
+    closed = []
+    fake.gateway.close = lambda: closed.append(True)
+    server.sensors = {{"fake": fake}}
+
+    async def killer():
+        await asyncio.sleep(0.3)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    async def main():
+        asyncio.ensure_future(killer())
+        await server.run()
+
+    asyncio.run(main())
+    print("EXITED_CLEANLY", "GATEWAY_CLOSED" if closed else "GATEWAY_NOT_CLOSED", flush=True)
+    """
+)
+
+
+def _run_signal_shutdown(port, loop="stdlib", timeout=15):
+    """Start the server in a subprocess, SIGTERM it, return its output."""
+    script = _SERVER_SCRIPT.format(repo_root=str(_REPO_ROOT), use_uvloop=loop, port=port)
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+
+
+# ---------------------------------------------------------------------------
+# SIGTERM through run() must terminate the process, not hang in serve_forever
+# ---------------------------------------------------------------------------
+class TestSignalShutdownStdlib(unittest.TestCase):
+    def test_sigterm_exits_cleanly_with_full_cleanup(self):
+        """The signal path must run the whole _shutdown — gateway cleanup
+        included — not just unblock run(); exercised via run(), not by
+        calling _shutdown(None) directly."""
+        result = _run_signal_shutdown(19301, loop="stdlib")
+        combined = result.stdout + result.stderr
+
+        self.assertEqual(result.returncode, 0, combined)
+        self.assertIn("EXITED_CLEANLY GATEWAY_CLOSED", result.stdout, combined)
+        self.assertIn("Shutdown complete.", combined)
+
+
+@unittest.skipUnless(uvloop is not None, "uvloop not installed")
+class TestSignalShutdownUvloop(unittest.TestCase):
+    def test_sigterm_exits_cleanly_under_uvloop(self):
+        """uvloop's Server.close() does not end serve_forever(); the serve
+        task must be cancelled explicitly or this times out."""
+        result = _run_signal_shutdown(19302, loop="uvloop")
+        combined = result.stdout + result.stderr
+
+        self.assertEqual(result.returncode, 0, combined)
+        self.assertIn("EXITED_CLEANLY GATEWAY_CLOSED", result.stdout, combined)
+        self.assertIn("Shutdown complete.", combined)
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    result = runner.run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)
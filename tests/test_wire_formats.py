@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Local unit tests for the wire formats and stream-shaping features:
+_build_message framing per wire_format, raw-frame field order/NaN
+handling, the per-client BINARY negotiation, and dedup/heartbeat.
+Runs without hardware (test_mode servers on localhost).
+
+Usage:
+    python tests/test_wire_formats.py
+"""
+
+import asyncio
+import json
+import math
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hepic_server.hepic_server import PiServer, msgpack
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _make_bare_server(wire_format="json", sensor_names=None):
+    """PiServer without __init__: just enough state for _build_message."""
+    server = PiServer.__new__(PiServer)
+    server._wire_format = wire_format
+    server._raw_field_order = None
+    server.sensor_name_by_id = {
+        name.lower(): name for name in (sensor_names or [])
+    }
+    return server
+
+
+def _make_config(port, **extra):
+    """Write a minimal config.json into a temp dir and return its path."""
+    tmp = Path(tempfile.mkdtemp())
+    config = {
+        "sensors_config_path": str(_REPO_ROOT / "sensors_config.yaml"),
+        "port": port,
+        "send_delay": 0.01,
+    }
+    config.update(extra)
+    config_path = tmp / "config.json"
+    config_path.write_text(json.dumps(config))
+    return config_path
+
+
+# ---------------------------------------------------------------------------
+# _build_message — framing per wire_format
+# ---------------------------------------------------------------------------
+class TestBuildMessageFraming(unittest.TestCase):
+    def test_json_frame_is_newline_terminated_envelope(self):
+        server = _make_bare_server("json")
+        frame = server._build_message("sensor_data", {"force": 1.5})
+
+        self.assertTrue(frame.endswith(b"}\n"))
+        parsed = json.loads(frame)
+        self.assertEqual(parsed["message_type"], "sensor_data")
+        self.assertEqual(parsed["payload"], {"force": 1.5})
+
+    @unittest.skipUnless(msgpack is not None, "msgpack not installed")
+    def test_msgpack_frame_is_length_prefixed(self):
+        server = _make_bare_server("msgpack")
+        frame = server._build_message("sensor_data", {"force": 1.5})
+
+        body_len = int.from_bytes(frame[:2], "big")
+        self.assertEqual(len(frame), 2 + body_len)
+        parsed = msgpack.unpackb(frame[2:])
+        self.assertEqual(parsed["message_type"], "sensor_data")
+        self.assertEqual(parsed["payload"], {"force": 1.5})
+
+    def test_raw_applies_only_to_sensor_data(self):
+        """sensor_config replies must stay JSON so clients can learn the layout."""
+        server = _make_bare_server("raw", sensor_names=["Force"])
+
+        data_frame = server._build_message("sensor_data", {"Force": 1.5})
+        self.assertFalse(data_frame.endswith(b"}\n"))
+
+        config_frame = server._build_message("sensor_config", {"sensors": []})
+        self.assertTrue(config_frame.endswith(b"}\n"))
+        self.assertEqual(json.loads(config_frame)["message_type"], "sensor_config")
+
+
+# ---------------------------------------------------------------------------
+# _build_raw_frame — field order and NaN handling
+# ---------------------------------------------------------------------------
+class TestRawFrame(unittest.TestCase):
+    def test_field_order_follows_sensors_config(self):
+        server = _make_bare_server("raw", sensor_names=["Force", "Meter"])
+        # payload deliberately in the opposite order of sensors_config
+        frame = server._build_raw_frame({"Meter": 2.0, "Force": 1.0})
+
+        body_len = int.from_bytes(frame[:2], "big")
+        self.assertEqual(body_len, 16)
+        values = struct.unpack("<2d", frame[2:])
+        self.assertEqual(values, (1.0, 2.0))
+
+    def test_unreachable_sensor_encodes_as_nan(self):
+        server = _make_bare_server("raw", sensor_names=["Force", "Meter"])
+        frame = server._build_raw_frame({"Force": 1.0, "Meter": None})
+
+        values = struct.unpack("<2d", frame[2:])
+        self.assertEqual(values[0], 1.0)
+        self.assertTrue(math.isnan(values[1]))
+
+    def test_field_order_is_cached_across_frames(self):
+        server = _make_bare_server("raw", sensor_names=["Force", "Meter"])
+        server._build_raw_frame({"Force": 1.0, "Meter": 2.0})
+        first_order = server._raw_field_order
+        server._build_raw_frame({"Meter": 4.0, "Force": 3.0})
+        self.assertIs(server._raw_field_order, first_order)
+        self.assertEqual(first_order, ("Force", "Meter"))
+
+
+# ---------------------------------------------------------------------------
+# BINARY negotiation — per-client opt-in and refcounting
+# ---------------------------------------------------------------------------
+class TestBinaryNegotiation(unittest.IsolatedAsyncioTestCase):
+    PORT = 19201
+
+    async def asyncSetUp(self):
+        self.server = PiServer(str(_make_config(self.PORT)), test_mode=True)
+        self.server_task = asyncio.create_task(self.server.run())
+        await asyncio.sleep(0.2)
+
+    async def asyncTearDown(self):
+        await self.server._shutdown(None)
+        self.server_task.cancel()
+
+    async def _read_raw_frame(self, reader):
+        """Skip any JSON frames sent before the handshake landed, then
+        return the values of the first length-prefixed raw frame."""
+        buffer = b""
+        while True:
+            buffer += await asyncio.wait_for(reader.read(4096), 2)
+            newline = buffer.rfind(b"}\n")
+            if newline != -1:
+                buffer = buffer[newline + 2:]
+            if len(buffer) >= 2:
+                body_len = int.from_bytes(buffer[:2], "big")
+                if body_len % 8 == 0 and len(buffer) >= 2 + body_len:
+                    return struct.unpack(f"<{body_len // 8}d", buffer[2:2 + body_len])
+
+    async def test_binary_client_gets_raw_frames_json_client_unaffected(self):
+        json_reader, json_writer = await asyncio.open_connection("127.0.0.1", self.PORT)
+        bin_reader, bin_writer = await asyncio.open_connection("127.0.0.1", self.PORT)
+        bin_writer.write(b"BINARY\n")
+        await bin_writer.drain()
+        await asyncio.sleep(0.05)
+
+        parsed = json.loads(await asyncio.wait_for(json_reader.readline(), 2))
+        self.assertEqual(parsed["message_type"], "sensor_data")
+
+        values = await self._read_raw_frame(bin_reader)
+        self.assertEqual(len(values), len(self.server.sensor_name_by_id))
+        self.assertTrue(all(not math.isnan(v) for v in values))
+
+        self.assertEqual(self.server._binary_clients, 1)
+
+        json_writer.close()
+        bin_writer.close()
+        await json_writer.wait_closed()
+        await bin_writer.wait_closed()
+
+    async def test_binary_counter_returns_to_zero_on_disconnect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.PORT)
+        writer.write(b"BINARY\n")
+        # repeated handshake must not double-count
+        writer.write(b"BINARY\n")
+        await writer.drain()
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.server._binary_clients, 1)
+
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(50):
+            if self.server._binary_clients == 0:
+                break
+            await asyncio.sleep(0.02)
+        self.assertEqual(self.server._binary_clients, 0)
+
+
+# ---------------------------------------------------------------------------
+# dedup — unchanged payloads are suppressed until the heartbeat fires
+# ---------------------------------------------------------------------------
+class TestDedupHeartbeat(unittest.IsolatedAsyncioTestCase):
+    PORT = 19202
+
+    async def test_unchanged_frames_are_suppressed(self):
+        """100 Hz cadence + 0.2 s poll + dedup: far fewer than 100 frames/s."""
+        config_path = _make_config(
+            self.PORT,
+            sensor_poll_delay=0.2,
+            dedup=True,
+            heartbeat_interval=0.15,
+        )
+        server = PiServer(str(config_path), test_mode=True)
+        server_task = asyncio.create_task(server.run())
+        await asyncio.sleep(0.2)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.PORT)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 0.6
+            frames = 0
+            while loop.time() < deadline:
+                try:
+                    await asyncio.wait_for(reader.readline(), 0.3)
+                except asyncio.TimeoutError:
+                    break
+                frames += 1
+            # ~60 frames would arrive without dedup; poll + heartbeat allow
+            # roughly 3-8 here. Generous bound to avoid timing flakiness.
+            self.assertGreater(frames, 0)
+            self.assertLess(frames, 20)
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await server._shutdown(None)
+            server_task.cancel()
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromModule(sys.modules[__name__])
+    result = runner.run(suite)
+    sys.exit(0 if result.wasSuccessful() else 1)